@@ -3,13 +3,38 @@
 # Tries the raw PDF endpoints discovered in the viewer HTML.
 # Run: python get_pima_pdf_v6.py
 import sys
+import functools
 import time
+import shutil
+import asyncio
+import threading
+from collections import Counter
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from urllib.parse import urljoin
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime
 
+try:
+    import httpx
+except ImportError:  # threaded stress loop only needs requests
+    httpx = None
+try:
+    import h2  # noqa: F401 - enables httpx's HTTP/2 support
+    HTTP2 = True
+except ImportError:
+    HTTP2 = False
+
+try:
+    import requests_cache
+except ImportError:  # endpoint probes just aren't cached
+    requests_cache = None
+
 BASE = "https://pimacountyaz-web.tylerhost.net"
+COOKIE_DOMAIN = "pimacountyaz-web.tylerhost.net"
 # Endpoints to try (order matters)
 CANDIDATE_PATHS = [
     "/web/document-image-pdf/DOC334S176//20252830551-1.pdf?index=1",
@@ -17,10 +42,15 @@ CANDIDATE_PATHS = [
     "/web/document/servepdf/DEGRADED-DOC334S176.1.pdf/20252830551.pdf?index=1&allowDownload=true&allowPrint=true",
 ]
 OUT = "pima_document_20252830551.pdf"
+LAST_GOOD_FILE = ".last_good_endpoint"  # remembers which candidate worked last run
+MAX_RETRIES = 3  # transport-level retries per request
+PROBE_CACHE = ".pima_cache"  # sqlite cache for HEAD probes (needs requests-cache)
 
 # Configuration for stress testing
 NUM_DOWNLOADS = 50  # Number of times to download the PDF
-DELAY_BETWEEN_REQUESTS = 0.1  # Seconds between requests (0.1 = 100ms)
+MAX_RATE = 10  # Requests per second across all workers (0 = unlimited)
+CONCURRENCY = 10  # Max downloads in flight at once
+STRESS_BACKEND = "async"  # "async" (httpx, HTTP/2) or "threads" (requests); threads if httpx is missing
 
 # >>> Paste your current JSESSIONID value here (from DevTools)
 JSESSIONID = "168B0656C702BC3042A3D68C26FFBAC4"   # <-- update when it changes
@@ -33,102 +63,301 @@ COMMON_HEADERS = {
     "Connection": "keep-alive",
 }
 
+class RateLimiter:
+    """Token bucket shared by all stress workers, async or threaded.
+
+    Each acquire books the next free slot under a lock and sleeps outside it,
+    so requests start at most max_rate per time_period without serial gaps.
+    """
+    def __init__(self, max_rate: float, time_period: float = 1.0):
+        self.interval = time_period / max_rate
+        self._next_slot = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Claim the next slot and return how long to wait for it"""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(self._next_slot, now)
+            self._next_slot = slot + self.interval
+            return slot - now
+
+    def __enter__(self):
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    async def __aenter__(self):
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+def make_limiter():
+    return RateLimiter(MAX_RATE) if MAX_RATE > 0 else nullcontext()
+
 def is_pdf_prefix(b: bytes) -> bool:
     return b.startswith(b"%PDF")
 
-def fetch(sess: requests.Session, url: str, attempt_num: int = 1) -> tuple[bytes|None, int, float]:
-    """Fetch PDF and return (result, status_code, response_time)"""
-    start_time = time.time()
+def last_good_path() -> str|None:
+    """The endpoint path that worked last run, if any"""
     try:
-        r = sess.get(url, headers=COMMON_HEADERS, stream=True, allow_redirects=True, timeout=60)
-        response_time = time.time() - start_time
-        
-        if r.status_code >= 400:
-            return None, r.status_code, response_time
-        
-        it = r.iter_content(chunk_size=8192)
-        first = next(it, b"")
-        if not is_pdf_prefix(first):
-            return None, r.status_code, response_time
-        
-        # Save with attempt number to avoid overwriting
-        output_file = f"pima_document_20252830551_attempt_{attempt_num}.pdf"
-        tmp = Path(output_file + ".part").open("wb")
-        with tmp as f:
-            f.write(first)
-            for chunk in it:
-                if chunk:
-                    f.write(chunk)
+        return Path(LAST_GOOD_FILE).read_text().strip() or None
+    except FileNotFoundError:
+        return None
+
+def probe_gone(sess: requests.Session, url: str) -> bool:
+    """HEAD the candidate first; True when the endpoint is definitely gone (404/410).
+
+    Only used with requests-cache, which keeps the answer for an hour so warm
+    runs skip dead candidates without a round-trip.
+    """
+    try:
+        h = sess.head(url, headers=COMMON_HEADERS, allow_redirects=True, timeout=30)
+    except requests.RequestException:
+        return False
+    return h.status_code in (404, 410)
+
+def probe(sess: requests.Session, path: str) -> str|None:
+    """Return path if its endpoint serves a PDF; only reads the first bytes"""
+    url = urljoin(BASE, path)
+    print(f"[*] Testing endpoint: {url}")
+    if requests_cache is not None and probe_gone(sess, url):
+        print(f"[✗] Endpoint gone (HEAD): {url}")
+        return None
+    try:
+        with sess.get(url, headers=COMMON_HEADERS, stream=True, allow_redirects=True, timeout=60) as r:
+            if r.status_code < 400:
+                r.raw.decode_content = True
+                if is_pdf_prefix(r.raw.read(8)):
+                    return path
+            print(f"[✗] No PDF from endpoint (status {r.status_code}): {url}")
+    except requests.RequestException as e:
+        print(f"[✗] Endpoint error: {url}: {e}")
+    return None
+
+def find_working_path(sess: requests.Session, skip: str|None = None) -> str|None:
+    """Probe the candidates (except skip) concurrently and keep the best PDF"""
+    rest = [p for p in CANDIDATE_PATHS if p != skip]
+    ex = ThreadPoolExecutor(max_workers=len(rest))
+    try:
+        # Probes run at once, but results are taken in CANDIDATE_PATHS order:
+        # a fallback rendition only wins once every preferred endpoint has failed
+        for future in [ex.submit(probe, sess, p) for p in rest]:
+            if path := future.result():
+                return path
+        return None
+    finally:
+        # Don't wait on the losers
+        ex.shutdown(wait=False, cancel_futures=True)
+
+def fetch(sess: requests.Session, url: str, attempt_num: int = 1, *, save: bool = False) -> tuple[bytes|None, int, int, int]:
+    """Fetch PDF and return (result, status_code, response_time_ns, bytes_received).
+
+    Only writes the PDF to disk when save=True; stress attempts just drain the body.
+    """
+    start = time.perf_counter_ns()
+    try:
+        with sess.get(url, headers=COMMON_HEADERS, stream=True, allow_redirects=True, timeout=60) as r:
+            response_time_ns = time.perf_counter_ns() - start
+
+            if r.status_code >= 400:
+                return None, r.status_code, response_time_ns, 0
+
+            # Read straight off the urllib3 stream instead of iter_content's per-chunk bytes
+            r.raw.decode_content = True
+            head = r.raw.read(8)
+            if not is_pdf_prefix(head):
+                return None, r.status_code, response_time_ns, len(head)
+
+            if not save:
+                total = len(head)
+                buf = bytearray(65536)
+                while n := r.raw.readinto(buf):
+                    total += n
+                return b"ok", r.status_code, response_time_ns, total
+
+            # Save with attempt number to avoid overwriting
+            output_file = f"pima_document_20252830551_attempt_{attempt_num}.pdf"
+            with Path(output_file + ".part").open("wb", buffering=65536) as f:
+                f.write(head)
+                shutil.copyfileobj(r.raw, f, length=65536)
+                total = f.tell()
         Path(output_file + ".part").rename(output_file)
-        return b"ok", r.status_code, response_time
+        return b"ok", r.status_code, response_time_ns, total
     except Exception as e:
-        response_time = time.time() - start_time
+        response_time_ns = time.perf_counter_ns() - start
         print(f"[!] Error in attempt {attempt_num}: {e}")
-        return None, 0, response_time
+        return None, 0, response_time_ns, 0
 
-def main():
-    if not JSESSIONID or len(JSESSIONID) < 8:
-        print("Please set a valid JSESSIONID near the top of this script.", file=sys.stderr)
-        sys.exit(2)
+async def fetch_async(client: "httpx.AsyncClient", url: str, sem: asyncio.Semaphore, limiter, attempt_num: int) -> tuple[bytes|None, int, int, int]:
+    """Async variant of fetch() used by the stress loop; sem bounds downloads in flight.
 
-    s = requests.Session()
-    # Set cookies exactly like the browser
-    s.cookies.set("JSESSIONID", JSESSIONID, domain="pimacountyaz-web.tylerhost.net", path="/")
-    s.cookies.set("disclaimerAccepted", "true", domain="pimacountyaz-web.tylerhost.net", path="/")
-    s.cookies.set("disclaimerAccepted", "true", domain="pimacountyaz-web.tylerhost.net", path="/web")
+    Only drains the body: the one saved copy comes from the sync fetch().
+    """
+    async with sem, limiter:
+        start = time.perf_counter_ns()
+        try:
+            async with client.stream("GET", url, headers=COMMON_HEADERS) as r:
+                response_time_ns = time.perf_counter_ns() - start
+
+                if r.status_code >= 400:
+                    return None, r.status_code, response_time_ns, 0
+
+                chunks = r.aiter_bytes(65536)
+                first = await anext(chunks, b"")
+                if not is_pdf_prefix(first):
+                    return None, r.status_code, response_time_ns, len(first)
+
+                total = len(first)
+                async for chunk in chunks:
+                    total += len(chunk)
+                return b"ok", r.status_code, response_time_ns, total
+        except Exception as e:
+            response_time_ns = time.perf_counter_ns() - start
+            print(f"[!] Error in attempt {attempt_num}: {e}")
+            return None, 0, response_time_ns, 0
 
+async def stress_test(url: str) -> list[tuple[bytes|None, int, int, int]]:
+    """Download url NUM_DOWNLOADS times over one httpx client (multiplexed on HTTP/2)"""
+    # Same cookies the requests.Session carries
+    cookies = httpx.Cookies()
+    cookies.set("JSESSIONID", JSESSIONID, domain=COOKIE_DOMAIN, path="/")
+    cookies.set("disclaimerAccepted", "true", domain=COOKIE_DOMAIN, path="/")
+    sem = asyncio.Semaphore(CONCURRENCY)
+    limiter = make_limiter()
+    async with httpx.AsyncClient(
+        http2=HTTP2,
+        limits=httpx.Limits(max_connections=20, max_keepalive_connections=20),
+        cookies=cookies,
+        headers={"X-Requested-With": "XMLHttpRequest", "ajaxRequest": "true"},
+        follow_redirects=True,
+        timeout=60,
+    ) as client:
+        return await asyncio.gather(*[
+            fetch_async(client, url, sem, limiter, attempt) for attempt in range(1, NUM_DOWNLOADS + 1)
+        ])
+
+def stress_test_threaded(sess: requests.Session, url: str) -> list[tuple[bytes|None, int, int, int]]:
+    """Download url NUM_DOWNLOADS times from a thread pool sharing sess"""
+    limiter = make_limiter()
+
+    def paced_fetch(attempt_num: int) -> tuple[bytes|None, int, int, int]:
+        with limiter:
+            return fetch(sess, url, attempt_num)
+
+    results = [None] * NUM_DOWNLOADS
+    # Workers stay below the adapter's pool_maxsize so every thread gets a pooled socket
+    with ThreadPoolExecutor(max_workers=CONCURRENCY) as ex:
+        futures = {ex.submit(paced_fetch, attempt): attempt for attempt in range(1, NUM_DOWNLOADS + 1)}
+        for future in as_completed(futures):
+            results[futures[future] - 1] = future.result()
+    return results
+
+@functools.lru_cache(maxsize=2)
+def build_session(jsessionid: str, retries: int = MAX_RETRIES) -> requests.Session:
+    """Fully configured session for jsessionid, built once and reused.
+
+    retries=0 gives a pooling-only session for the stress attempts, so server
+    errors are counted as they happen instead of being retried away.
+    """
+    if requests_cache is not None:
+        # Only HEAD probes are cached; PDF GETs always go to the server
+        s = requests_cache.CachedSession(PROBE_CACHE, backend="sqlite", expire_after=3600,
+                                         allowable_methods=("HEAD",), allowable_codes=(200, 404, 410))
+    else:
+        s = requests.Session()
+    # Pool large enough that concurrent downloads reuse keep-alive sockets
+    retry = Retry(total=retries, backoff_factor=0.3,
+                  status_forcelist=(429, 500, 502, 503, 504),
+                  allowed_methods=("GET", "POST"), raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=retry if retries else 0)
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    # Set cookies exactly like the browser
+    for name, value, path in (("JSESSIONID", jsessionid, "/"),
+                              ("disclaimerAccepted", "true", "/"),
+                              ("disclaimerAccepted", "true", "/web")):
+        s.cookies.set(name, value, domain=COOKIE_DOMAIN, path=path)
     # Some AJAX endpoints check these headers — add as general headers when needed
     s.headers.update({
         "X-Requested-With": "XMLHttpRequest",
         "ajaxRequest": "true",
     })
+    return s
+
+def main():
+    if not JSESSIONID or len(JSESSIONID) < 8:
+        print("Please set a valid JSESSIONID near the top of this script.", file=sys.stderr)
+        sys.exit(2)
+
+    s = build_session(JSESSIONID)
 
     # Statistics tracking
     successful_downloads = 0
     failed_downloads = 0
-    total_time = 0
-    status_codes = {}
+    total_time_ns = 0
+    total_bytes = 0
     
-    print(f"[*] Starting stress test: {NUM_DOWNLOADS} downloads with {DELAY_BETWEEN_REQUESTS}s delay")
+    backend = STRESS_BACKEND if httpx is not None else "threads"
+    print(f"[*] Starting stress test: {NUM_DOWNLOADS} downloads, {CONCURRENCY} concurrent ({backend}), max {MAX_RATE or 'unlimited'} req/s, HTTP/2: {HTTP2 and backend == 'async'}")
     print(f"[*] Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     
-    # Find working endpoint first
-    working_url = None
-    for path in CANDIDATE_PATHS:
-        url = urljoin(BASE, path)
-        print(f"[*] Testing endpoint: {url}")
-        result, status_code, response_time = fetch(s, url, 0)
-        if result:
-            working_url = url
-            print(f"[✓] Found working endpoint: {url}")
-            break
-        else:
+    # Find working endpoint first. Last run's endpoint is checked by the download
+    # that saves our one copy of the PDF, so a warm run costs a single GET.
+    path = last_good_path()
+    saved = False
+    if path:
+        print(f"[*] Testing endpoint: {urljoin(BASE, path)}")
+        result, status_code, _, _ = fetch(s, urljoin(BASE, path), 0, save=True)
+        saved = bool(result)
+        if not saved:
             print(f"[✗] Endpoint failed with status {status_code}")
-    
-    if not working_url:
+    if not saved:
+        path = find_working_path(s, skip=path)
+    if not path:
         print("[!] No working endpoints found!")
         return 2
+    working_url = urljoin(BASE, path)
+    Path(LAST_GOOD_FILE).write_text(path)
+    print(f"[✓] Found working endpoint: {working_url}")
+
+    # Keep one saved copy of the PDF; the stress attempts don't write
+    if not saved:
+        result, status_code, _, _ = fetch(s, working_url, 0, save=True)
+        if not result:
+            print(f"[!] Saving the PDF failed with status {status_code}")
     
     # Now stress test the working endpoint
-    for attempt in range(1, NUM_DOWNLOADS + 1):
-        print(f"\n[*] Download attempt {attempt}/{NUM_DOWNLOADS}")
-        
-        result, status_code, response_time = fetch(s, working_url, attempt)
-        total_time += response_time
-        
-        # Track status codes
-        status_codes[status_code] = status_codes.get(status_code, 0) + 1
+    wall_start = time.perf_counter_ns()
+    if backend == "async":
+        results = asyncio.run(stress_test(working_url))
+    else:
+        # Like the httpx backend, no transport retries: each attempt reports what the server did
+        results = stress_test_threaded(build_session(JSESSIONID, retries=0), working_url)
+    wall_time = (time.perf_counter_ns() - wall_start) / 1e9
+
+    # Tasks only return their outcome; tally status codes once everything is in
+    status_codes = Counter(status_code for _, status_code, _, _ in results)
+
+    for attempt, (result, status_code, response_time_ns, nbytes) in enumerate(results, start=1):
+        total_time_ns += response_time_ns
+        total_bytes += nbytes
+        response_time = response_time_ns / 1e9
         
         if result:
             successful_downloads += 1
-            print(f"[✓] Success! Response time: {response_time:.2f}s")
+            print(f"[✓] Attempt {attempt}/{NUM_DOWNLOADS} succeeded! Response time: {response_time:.2f}s")
         else:
             failed_downloads += 1
-            print(f"[✗] Failed! Status: {status_code}, Response time: {response_time:.2f}s")
-        
-        # Add delay between requests
-        if attempt < NUM_DOWNLOADS and DELAY_BETWEEN_REQUESTS > 0:
-            time.sleep(DELAY_BETWEEN_REQUESTS)
+            print(f"[✗] Attempt {attempt}/{NUM_DOWNLOADS} failed! Status: {status_code}, Response time: {response_time:.2f}s")
     
     # Print final statistics
     print(f"\n{'='*50}")
@@ -138,8 +367,11 @@ def main():
     print(f"Successful downloads: {successful_downloads}")
     print(f"Failed downloads: {failed_downloads}")
     print(f"Success rate: {(successful_downloads/NUM_DOWNLOADS)*100:.1f}%")
+    total_time = total_time_ns / 1e9
     print(f"Average response time: {total_time/NUM_DOWNLOADS:.2f}s")
     print(f"Total time: {total_time:.2f}s")
+    print(f"Wall-clock time: {wall_time:.2f}s")
+    print(f"Bytes received: {total_bytes} ({total_bytes / max(wall_time, 1e-9) / 1024 / 1024:.2f} MiB/s)")
     print(f"Ended at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print(f"\nStatus code distribution:")
     for code, count in sorted(status_codes.items()):
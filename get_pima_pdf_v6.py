@@ -3,11 +3,21 @@
 # Tries the raw PDF endpoints discovered in the viewer HTML.
 # Run: python get_pima_pdf_v6.py
 import sys
+import functools
+import shutil
 from pathlib import Path
 from urllib.parse import urljoin
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import requests_cache
+except ImportError:  # endpoint probes just aren't cached
+    requests_cache = None
 
 BASE = "https://pimacountyaz-web.tylerhost.net"
+COOKIE_DOMAIN = "pimacountyaz-web.tylerhost.net"
 # Endpoints to try (order matters)
 CANDIDATE_PATHS = [
     "/web/document-image-pdf/DOC334S176//20252830551-1.pdf?index=1",
@@ -15,6 +25,9 @@ CANDIDATE_PATHS = [
     "/web/document/servepdf/DEGRADED-DOC334S176.1.pdf/20252830551.pdf?index=1&allowDownload=true&allowPrint=true",
 ]
 OUT = "pima_document_20252830551.pdf"
+LAST_GOOD_FILE = ".last_good_endpoint"  # remembers which candidate worked last run
+MAX_RETRIES = 3  # transport-level retries per request
+PROBE_CACHE = ".pima_cache"  # sqlite cache for HEAD probes (needs requests-cache)
 
 # >>> Paste your current JSESSIONID value here (from DevTools)
 JSESSIONID = "168B0656C702BC3042A3D68C26FFBAC4"   # <-- update when it changes
@@ -30,47 +43,87 @@ COMMON_HEADERS = {
 def is_pdf_prefix(b: bytes) -> bool:
     return b.startswith(b"%PDF")
 
+def candidate_paths() -> list[str]:
+    """CANDIDATE_PATHS with the endpoint that worked last run tried first"""
+    try:
+        last = Path(LAST_GOOD_FILE).read_text().strip()
+    except FileNotFoundError:
+        return CANDIDATE_PATHS
+    return list(dict.fromkeys([last] + CANDIDATE_PATHS)) if last else CANDIDATE_PATHS
+
+def probe_gone(sess: requests.Session, url: str) -> bool:
+    """HEAD the candidate first; True when the endpoint is definitely gone (404/410).
+
+    Only used with requests-cache, which keeps the answer for an hour so warm
+    runs skip dead candidates without a round-trip.
+    """
+    try:
+        h = sess.head(url, headers=COMMON_HEADERS, allow_redirects=True, timeout=30)
+    except requests.RequestException:
+        return False
+    return h.status_code in (404, 410)
+
 def fetch(sess: requests.Session, url: str) -> bytes|None:
-    r = sess.get(url, headers=COMMON_HEADERS, stream=True, allow_redirects=True, timeout=60)
-    if r.status_code >= 400:
-        return None
-    it = r.iter_content(chunk_size=8192)
-    first = next(it, b"")
-    if not is_pdf_prefix(first):
-        return None
-    # stream to file
-    tmp = Path(OUT + ".part").open("wb")
-    with tmp as f:
-        f.write(first)
-        for chunk in it:
-            if chunk:
-                f.write(chunk)
+    with sess.get(url, headers=COMMON_HEADERS, stream=True, allow_redirects=True, timeout=60) as r:
+        if r.status_code >= 400:
+            return None
+        # Read straight off the urllib3 stream; copyfileobj reuses one buffer in C
+        r.raw.decode_content = True
+        head = r.raw.read(8)
+        if not is_pdf_prefix(head):
+            return None
+        # stream to file
+        with Path(OUT + ".part").open("wb", buffering=65536) as f:
+            f.write(head)
+            shutil.copyfileobj(r.raw, f, length=65536)
     Path(OUT + ".part").rename(OUT)
     return b"ok"
 
-def main():
-    if not JSESSIONID or len(JSESSIONID) < 8:
-        print("Please set a valid JSESSIONID near the top of this script.", file=sys.stderr)
-        sys.exit(2)
-
-    s = requests.Session()
+@functools.lru_cache(maxsize=1)
+def build_session(jsessionid: str) -> requests.Session:
+    """Fully configured session for jsessionid, built once and reused"""
+    if requests_cache is not None:
+        # Only HEAD probes are cached; PDF GETs always go to the server
+        s = requests_cache.CachedSession(PROBE_CACHE, backend="sqlite", expire_after=3600,
+                                         allowable_methods=("HEAD",), allowable_codes=(200, 404, 410))
+    else:
+        s = requests.Session()
+    # Pool large enough that concurrent downloads reuse keep-alive sockets
+    retry = Retry(total=MAX_RETRIES, backoff_factor=0.3,
+                  status_forcelist=(429, 500, 502, 503, 504),
+                  allowed_methods=("GET", "POST"), raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=retry)
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
     # Set cookies exactly like the browser
-    s.cookies.set("JSESSIONID", JSESSIONID, domain="pimacountyaz-web.tylerhost.net", path="/")
-    s.cookies.set("disclaimerAccepted", "true", domain="pimacountyaz-web.tylerhost.net", path="/")
-    s.cookies.set("disclaimerAccepted", "true", domain="pimacountyaz-web.tylerhost.net", path="/web")
-
+    for name, value, path in (("JSESSIONID", jsessionid, "/"),
+                              ("disclaimerAccepted", "true", "/"),
+                              ("disclaimerAccepted", "true", "/web")):
+        s.cookies.set(name, value, domain=COOKIE_DOMAIN, path=path)
     # Some AJAX endpoints check these headers — add as general headers when needed
     s.headers.update({
         "X-Requested-With": "XMLHttpRequest",
         "ajaxRequest": "true",
     })
+    return s
+
+def main():
+    if not JSESSIONID or len(JSESSIONID) < 8:
+        print("Please set a valid JSESSIONID near the top of this script.", file=sys.stderr)
+        sys.exit(2)
+
+    s = build_session(JSESSIONID)
 
     # Try each candidate
-    for path in CANDIDATE_PATHS:
+    for path in candidate_paths():
         url = urljoin(BASE, path)
         print("[*] Trying", url)
+        if requests_cache is not None and probe_gone(s, url):
+            print("[✗] Endpoint gone (HEAD)")
+            continue
         ok = fetch(s, url)
         if ok:
+            Path(LAST_GOOD_FILE).write_text(path)
             print("[✓] Saved to", OUT)
             return 0
 
@@ -0,0 +1,433 @@
+#!/usr/bin/env python3
+"""
+pima_client.py
+
+Shared Tyler Host client for the Pima County recorder site: bootstraps the
+session, submits a search (dates + doc types), fetches results pages
+(concurrently) and keeps the session alive. Can dump HTML/JSON to disk.
+
+Entry-point scripts build a Config and call run(config).
+"""
+
+import os
+import inspect
+import time
+import asyncio
+import itertools
+import queue
+import threading
+import atexit
+import random
+import re
+from datetime import datetime
+from dataclasses import dataclass, field
+from functools import partial
+from types import MappingProxyType
+from typing import Dict, List, Optional
+from urllib.parse import urljoin, urlencode
+
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import brotli  # lets urllib3 decode br-compressed responses
+except ImportError:
+    brotli = None
+try:
+    import zstandard  # same for zstd (urllib3 2.x)
+except ImportError:
+    zstandard = None
+
+# Retry(backoff_jitter=...) needs urllib3 2.x; on 1.26 retries just aren't jittered
+_RETRY_JITTER = {"backoff_jitter": 0.5} if "backoff_jitter" in inspect.signature(Retry).parameters else {}
+
+BASE = "https://pimacountyaz-web.tylerhost.net"
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/140.0.0.0 Safari/537.36"
+)
+
+_DATE_RE = re.compile(r"^(0?[1-9]|1[0-2])/(0?[1-9]|[12]\d|3[01])/\d{4}$")
+
+def _valid_date(d: str) -> bool:
+    if not _DATE_RE.match(d):
+        return False
+    try:
+        datetime.strptime(d, "%m/%d/%Y")  # month lengths / leap years
+    except ValueError:
+        return False
+    return True
+
+def _build_form(start_date: str, end_date: str, doc_types: List[str]) -> list[tuple[str, str]]:
+    """searchPost form fields for the given dates and document types."""
+    form = [
+        ("field_RecordingDateID_DOT_StartDate", start_date),
+        ("field_RecordingDateID_DOT_EndDate",   end_date),
+    ]
+    for entry in doc_types:
+        if ":" in entry:
+            code, label = entry.split(":", 1)
+        else:
+            code, label = entry, entry
+        form.append(("field_selfservice_documentTypes-holderInput", code.strip()))
+        form.append(("field_selfservice_documentTypes-holderValue", label.strip()))
+    form.append(("field_selfservice_documentTypes-containsInput", "Contains Any"))
+    form.append(("field_selfservice_documentTypes", ""))
+    return form
+
+@dataclass(slots=True)
+class Config:
+    """Run settings; see the CONFIG section of test.py for what each one does"""
+    start_date: str                                   # MM/DD/YYYY
+    end_date: str
+    doc_types: List[str] = field(default_factory=lambda: ["NTSALE", "CNLNT"])
+    results_page: Optional[int] = None                # 1-based; None = every page
+    page_concurrency: int = 8
+    keepalive_interval: float = 300
+    step_delay: float = 0.5
+    parallel_bootstrap: bool = False
+    verbose: bool = True
+    debug: bool = False
+    dump_html: bool = True
+    output_dir: str = "Results"
+    dump_steps: Dict[str, bool] = field(default_factory=dict)
+    search_body: bytes = field(init=False, repr=False)
+
+    def __post_init__(self):
+        # Dates are fixed for the run, so validate them and encode the POST body once
+        for d in (self.start_date, self.end_date):
+            if not _valid_date(d):
+                raise ValueError(f"Invalid date '{d}'. Use MM/DD/YYYY.")
+        self.search_body = urlencode(
+            _build_form(self.start_date, self.end_date, self.doc_types)
+        ).encode("ascii")
+
+    def vprint(self, *a, **k):
+        if self.verbose:
+            print(*a, **k)
+
+# searchPost reply (totalPages, currentPage, ...), filled in by submit_search()
+_SEARCH_META: dict = {}
+
+# URLs and headers used on every page fetch/ping, resolved once (headers read-only; copy to change)
+SEARCH_URL = urljoin(BASE, "/web/search/DOCSEARCH55S8")
+SEARCH_POST_URL = urljoin(BASE, "/web/searchPost/DOCSEARCH55S8")
+RESULTS_URL = urljoin(BASE, "/web/searchResults/DOCSEARCH55S8")
+PING_URL = urljoin(BASE, "/web/session/pingSession")
+XHR_HEADERS = MappingProxyType({
+    "X-Requested-With": "XMLHttpRequest",
+    "Accept": "*/*",
+    "Referer": SEARCH_URL,
+})
+_AJAX_GET_HEADERS = MappingProxyType({
+    "X-Requested-With": "XMLHttpRequest",
+    "Cache-Control": "no-cache",
+    "Pragma": "no-cache",
+})
+_AJAX_POST_HEADERS = MappingProxyType({
+    "X-Requested-With": "XMLHttpRequest",
+})
+
+# Only advertise codings urllib3 can actually decode here
+_ACCEPT_ENCODING = "gzip, deflate"
+if brotli is not None:
+    _ACCEPT_ENCODING = "br, " + _ACCEPT_ENCODING
+if zstandard is not None:
+    _ACCEPT_ENCODING = "zstd, " + _ACCEPT_ENCODING
+
+def make_session() -> requests.Session:
+    s = requests.Session()
+    s.headers.update({
+        "User-Agent": USER_AGENT,
+        "Accept-Language": "en-US,en;q=0.9",
+        "Accept-Encoding": _ACCEPT_ENCODING,
+        "Connection": "keep-alive",
+    })
+    # GETs that hit a 5xx are retried inside the pool with jittered exponential backoff.
+    # urllib3 2.x retries once immediately, then sleeps factor * 2**(n-1):
+    # 0s, 0.7s, 1.4s, 2.8s (+ jitter), close to the old loop's 0.7s, then x1.8 + jitter
+    retry = Retry(
+        total=4,
+        backoff_factor=0.35,
+        **_RETRY_JITTER,  # concurrent page fetches shouldn't retry in lockstep
+        status_forcelist=(500, 502, 503, 504),
+        allowed_methods=frozenset(["GET"]),
+        raise_on_status=False,  # hand back the last 5xx so callers can report it
+    )
+    # One host, so one pool; sized for the concurrent page fetches
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=16, max_retries=retry)
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    return s
+
+# jQuery-style cache-buster for "_" params: epoch ms at startup, then +1 per request
+_cache_buster = itertools.count(time.time_ns() // 1_000_000)
+
+def ensure_ok(resp: requests.Response, label: str):
+    if not resp.ok:
+        raise RuntimeError(f"{label}: HTTP {resp.status_code}")
+    return resp
+
+# ---------- dump helpers ----------
+_SAFE_RE = re.compile(r"[^A-Za-z0-9._-]+")
+
+def _ts() -> str:
+    # safe timestamp for filenames
+    return time.strftime("%Y%m%d-%H%M%S")
+
+def _safe(name: str) -> str:
+    # keep it readable but file-system safe
+    return _SAFE_RE.sub("_", name)[:80]
+
+# Output dirs already created this run, so only the first dump into each pays for makedirs
+_ready_dirs: set[str] = set()
+
+# dump() hands writes to one background writer so callers never wait on disk
+_WRITE_Q: queue.Queue = queue.Queue(maxsize=256)
+
+def _writer():
+    while True:
+        path, content = _WRITE_Q.get()
+        try:
+            mode = "wb" if isinstance(content, (bytes, bytearray)) else "w"
+            with open(path, mode, encoding=None if "b" in mode else "utf-8") as f:
+                f.write(content)
+        except OSError as e:
+            print(f"dump failed for {path}: {e}")
+        finally:
+            _WRITE_Q.task_done()
+
+# Started by the first dump, so importing this module doesn't spawn a thread
+_writer_started = False
+_writer_lock = threading.Lock()
+
+def _start_writer():
+    global _writer_started
+    with _writer_lock:
+        if not _writer_started:
+            threading.Thread(target=_writer, name="dump-writer", daemon=True).start()
+            atexit.register(_WRITE_Q.join)  # let queued dumps reach disk before exit
+            _writer_started = True
+
+def _dump_path(cfg: Config, step_name: str, ext: str, tag: str = "") -> str | None:
+    """Destination for a dump, or None if dumping is off for this step."""
+    if not cfg.dump_html or not cfg.dump_steps.get(step_name, False):
+        return None
+    if cfg.output_dir not in _ready_dirs:
+        os.makedirs(cfg.output_dir, exist_ok=True)
+        _ready_dirs.add(cfg.output_dir)
+    fn = f"{_ts()}_{_safe(step_name + tag)}.{ext}"
+    return os.path.join(cfg.output_dir, fn)
+
+def dump(cfg: Config, step_name: str, content: str | bytes, ext: str = "html", tag: str = ""):
+    """Queue content for cfg.output_dir if enabled for this step (tag keeps same-second dumps apart)."""
+    full = _dump_path(cfg, step_name, ext, tag)
+    if full is None:
+        return None
+    if not _writer_started:
+        _start_writer()
+    _WRITE_Q.put((full, content))
+    cfg.vprint(f"📝 dumped → {full}")
+    return full
+
+def dump_stream(cfg: Config, step_name: str, resp: requests.Response, ext: str = "html", tag: str = ""):
+    """Like dump(), but copies a stream=True response body to disk in 64 KiB chunks.
+
+    Written inline rather than through the writer queue: the body is still
+    coming off the socket, and this already runs on a fetch worker thread.
+    """
+    full = _dump_path(cfg, step_name, ext, tag)
+    if full is None:
+        resp.content  # still drain the body so the connection returns to the pool
+        return None
+    with open(full, "wb") as f:
+        for chunk in resp.iter_content(65536):
+            f.write(chunk)
+    cfg.vprint(f"📝 dumped → {full}")
+    return full
+# -----------------------------------
+
+def ajax_get(s: requests.Session, url, referer=None, accept="text/html, */*; q=0.01", params=None, timeout=30):
+    headers = dict(_AJAX_GET_HEADERS, Accept=accept)
+    if referer:
+        headers["Referer"] = referer
+    r = s.get(url, params=params, headers=headers, timeout=timeout)
+    return r
+
+def ajax_post(s: requests.Session, url, referer=None, origin=None, accept="*/*", data=b"", timeout=30):
+    headers = dict(_AJAX_POST_HEADERS, Accept=accept)
+    if origin:
+        headers["Origin"] = origin
+    if referer:
+        headers["Referer"] = referer
+    r = s.post(url, headers=headers, data=data, timeout=timeout)
+    return r
+
+async def _gather_threads(calls):
+    """Run blocking calls at once on worker threads; results come back in call order."""
+    return await asyncio.gather(*[asyncio.to_thread(c) for c in calls])
+
+def disclaimer_flow(s: requests.Session, cfg: Config):
+    """1) GET disclaimer, 2) POST accept, 3) GET /web/?_, 4) POST homeActions,
+       5) GET action group, 6) GET search page
+    """
+    # 1) GET /web/user/disclaimer
+    disclaimer = urljoin(BASE, "/web/user/disclaimer")
+    r1 = s.get(disclaimer, headers={
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7",
+        "Upgrade-Insecure-Requests": "1",
+        "Sec-Fetch-Site": "none",
+        "Sec-Fetch-Mode": "navigate",
+        "Sec-Fetch-User": "?1",
+        "Sec-Fetch-Dest": "document",
+    }, timeout=30)
+    ensure_ok(r1, "GET /web/user/disclaimer")
+    cfg.vprint("1) GET disclaimer →", r1.status_code)
+    dump(cfg, "disclaimer_get", r1.content, "html")
+
+    # 2) POST /web/user/disclaimer
+    r2 = ajax_post(
+        s, disclaimer, referer=disclaimer, origin=BASE,
+        accept="application/json, text/javascript, */*; q=0.01", data=b""
+    )
+    ensure_ok(r2, "POST /web/user/disclaimer")
+    cfg.vprint("2) POST disclaimer →", r2.status_code, "; jsid:", s.cookies.get("JSESSIONID"))
+    if cfg.debug:
+        print("   cookies:", s.cookies.get_dict())
+    # The response is JSON; store it if requested
+    try:
+        dump(cfg, "disclaimer_post_json", r2.content, "json")
+    except Exception:
+        pass
+    # The server has answered; no need to wait, just make sure it handed out a session
+    if "JSESSIONID" not in s.cookies:
+        raise RuntimeError("POST /web/user/disclaimer: no JSESSIONID cookie set")
+
+    # 3) GET /web/?_=  4) POST /web/homeActions  5) GET ACTIONGROUP55S1  6) GET DOCSEARCH55S8
+    web_root = urljoin(BASE, "/web/")
+    home_actions = urljoin(BASE, "/web/homeActions")
+    action = urljoin(BASE, "/web/action/ACTIONGROUP55S1")
+    steps = [  # (error label, log label, dump step, request)
+        ("GET /web/?_", "3) GET /web/?_ →", "web_root",
+         partial(ajax_get, s, web_root, referer=disclaimer, accept="text/html, */*; q=0.01",
+                 params={"_": next(_cache_buster)})),
+        ("POST /web/homeActions", "4) POST /web/homeActions →", "home_actions",  # may be empty, but we keep a stub
+         partial(ajax_post, s, home_actions, referer=disclaimer, origin=BASE, data=b"")),
+        ("GET /web/action/ACTIONGROUP55S1", "5) GET ACTIONGROUP55S1 →", "action_group",
+         partial(ajax_get, s, action, referer=web_root, params={"_": next(_cache_buster)})),
+        ("GET /web/search/DOCSEARCH55S8", "6) GET DOCSEARCH55S8 →", "search_page",
+         partial(ajax_get, s, SEARCH_URL, referer=action, params={"_": next(_cache_buster)})),
+    ]
+    if cfg.parallel_bootstrap:
+        # They only need the session cookie from step 2, so send them all at once
+        responses = asyncio.run(_gather_threads([req for *_, req in steps]))
+    else:
+        responses = (req() for *_, req in steps)  # lazy: one at a time, stop at the first failure
+    for (label, log, step_name, _), r in zip(steps, responses):
+        ensure_ok(r, label)
+        cfg.vprint(log, r.status_code)
+        dump(cfg, step_name, r.content, "html")
+
+    # Single optional pause once the whole flow is done (0 to skip)
+    if cfg.step_delay:
+        time.sleep(cfg.step_delay)
+
+def submit_search(s: requests.Session, cfg: Config) -> dict:
+    """POST the required form so results are available server-side; returns the JSON reply."""
+    global _SEARCH_META
+    # Through s so the POST reuses the bootstrap's keep-alive connection and cookies
+    r = s.post(
+        SEARCH_POST_URL,
+        headers={
+            "Accept": "application/json, text/javascript, */*; q=0.01",
+            "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8",
+            "X-Requested-With": "XMLHttpRequest",
+            "ajaxRequest": "true",
+            "Origin": BASE,
+            "Referer": SEARCH_URL,
+        },
+        data=cfg.search_body,
+        timeout=30,
+    )
+    ensure_ok(r, "POST /web/searchPost/DOCSEARCH55S8")
+    cfg.vprint(f"7) POST searchPost → {r.status_code}; body len={len(r.content)}")
+    # reuse key to save JSON; the tag keeps it from overwriting the same-second disclaimer reply
+    dump(cfg, "disclaimer_post_json", r.content, "json", tag="_search")
+    time.sleep(cfg.step_delay)
+    try:
+        meta = orjson.loads(r.content)
+    except orjson.JSONDecodeError:
+        meta = None
+    _SEARCH_META = meta if isinstance(meta, dict) else {}
+    return _SEARCH_META
+
+def fetch_results_page(s: requests.Session, cfg: Config, page: int):
+    """GET the results page after the search has been posted and dump HTML."""
+    # 5xx retries happen in the adapter (see make_session)
+    r = s.get(RESULTS_URL, params={"page": page, "_": next(_cache_buster)},
+              headers=XHR_HEADERS, timeout=30, stream=True)
+    if r.status_code >= 500:
+        cfg.vprint(f"WARN: searchResults {r.status_code} after retries; body preview: {r.text[:200].replace(chr(10),' ')}")
+        return None
+    ensure_ok(r, "GET /web/searchResults/DOCSEARCH55S8")
+    cfg.vprint(f"8) GET searchResults page={page} →", r.status_code)
+    # Body goes straight from the socket to disk, never decoded to str
+    dump_stream(cfg, "search_results", r, "html", tag=f"_p{page}")
+    return r
+
+async def fetch_all_pages(s: requests.Session, cfg: Config):
+    """Fetch every page the search reported on worker threads, cfg.page_concurrency at a time."""
+    try:
+        total_pages = int(_SEARCH_META.get("totalPages", 1))
+    except (ValueError, TypeError):
+        total_pages = 1
+    sem = asyncio.Semaphore(cfg.page_concurrency)
+
+    async def fetch_one(page: int):
+        async with sem:
+            return await asyncio.to_thread(fetch_results_page, s, cfg, page)
+
+    return await asyncio.gather(*[fetch_one(p) for p in range(1, total_pages + 1)])
+
+async def keepalive(s: requests.Session, cfg: Config):
+    cfg.vprint(f"9) Starting keep-alive: {PING_URL} every {cfg.keepalive_interval}s")
+    while True:
+        try:
+            r = await asyncio.to_thread(s.get, PING_URL, params={"_": next(_cache_buster)},
+                                        headers=XHR_HEADERS, timeout=30)
+            cfg.vprint(f"PING → {r.status_code} ; {r.text.strip()[:120]}")
+            if r.status_code in (401, 403):
+                print("Session rejected (401/403). Exiting.")
+                break
+        except requests.RequestException as e:
+            cfg.vprint(f"PING error: {e}")
+        await asyncio.sleep(max(5, cfg.keepalive_interval * (1 + random.uniform(-0.1, 0.1))))
+
+async def run_session(s: requests.Session, cfg: Config):
+    """Fetch the results while the keep-alive pings, then keep pinging until stopped."""
+    ka = asyncio.create_task(keepalive(s, cfg))
+    try:
+        if cfg.results_page is None:
+            await fetch_all_pages(s, cfg)
+        else:
+            await asyncio.to_thread(fetch_results_page, s, cfg, cfg.results_page)
+        await ka
+    finally:
+        ka.cancel()
+        await asyncio.gather(ka, return_exceptions=True)
+
+def run(cfg: Config):
+    """Bootstrap, search, fetch results, then keep the session alive until stopped."""
+    s = make_session()
+    try:
+        disclaimer_flow(s, cfg)
+        submit_search(s, cfg)
+        asyncio.run(run_session(s, cfg))
+    except KeyboardInterrupt:
+        print("Stopped.")
+    except Exception as e:
+        print("Error:", e)
@@ -18,17 +18,33 @@ Features:
 """
 
 import os
+import inspect
 import time
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
 import random
 import re
-import json
+import threading
+from http.cookiejar import LWPCookieJar, LoadError
 from datetime import datetime
 from urllib.parse import urljoin
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Any, Tuple
+from dataclasses import dataclass, field
 
+import orjson
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from selectolax.lexbor import LexborHTMLParser as HTMLParser
+
+try:
+    import brotli  # lets urllib3 decode br-compressed responses
+except ImportError:
+    brotli = None
+
+# Retry(backoff_jitter=...) needs urllib3 2.x; on 1.26 retries just aren't jittered
+_RETRY_JITTER = {"backoff_jitter": 0.5} if "backoff_jitter" in inspect.signature(Retry).parameters else {}
 
 # =========================
 # ======= CONFIG ==========
@@ -45,11 +61,20 @@ DOC_TYPES = ["NTSALE", "CNLNT"]
 # Output settings
 OUTPUT_DIR = "Results"
 OUTPUT_FILE = "pima_all_pages_complete.json"
+NDJSON_FILE = "pima_all_pages_complete.ndjson"  # records streamed here as pages are parsed
+SUMMARY_FILE = "pima_all_pages_complete.summary.json"  # run stats sidecar for the NDJSON
+KEEP_IN_MEMORY = False  # also collect every record in results.documents (old behavior)
+COOKIE_FILE = ".pima_cookies"  # session cookies kept between runs
 
 # Request settings
-STEP_DELAY = 0.5  # delay between requests
-PAGE_DELAY = 1.0  # delay between pages
-MAX_RETRIES = 3
+ESTABLISH_DELAY = 0.0  # fixed pause between session setup steps
+STEP_DELAY = 0.5  # extra pause after a setup step the server throttled (429/503)
+PAGE_DELAY = 1.0  # max random jitter before each page request
+PAGE_CONCURRENCY = 8  # result pages fetched at once
+PARSE_WORKERS = 2  # parser processes (one task feeds each) for fetched pages
+FETCH_AHEAD = 4  # fetched pages allowed to wait for a parser
+PING_INTERVAL = 60  # seconds between background keep-alive pings
+MAX_RETRIES = 3  # handled by urllib3 on the session adapter
 REQUEST_TIMEOUT = 30
 
 # Verbose logging
@@ -65,7 +90,47 @@ USER_AGENT = (
     "Chrome/140.0.0.0 Safari/537.36"
 )
 
-@dataclass
+# URLs and headers used on every page fetch/ping, resolved once
+SEARCH_URL = urljoin(BASE, "/web/search/DOCSEARCH55S8")
+RESULTS_URL = urljoin(BASE, "/web/searchResults/DOCSEARCH55S8")
+PING_URL = urljoin(BASE, "/web/session/pingSession")
+XHR_HEADERS = {
+    "X-Requested-With": "XMLHttpRequest",
+    "Accept": "*/*",
+    "Referer": SEARCH_URL,
+}
+
+# CSS selectors used on every page/row, kept in one place
+SEL_RESULT_LIST = "ul.selfServiceSearchResultList"
+SEL_ROW = "li.ss-search-row"
+SEL_COLUMN = "div.searchResultThreeColumn"
+SEL_ACTION_LINK = "a[href]"
+SEL_AVATAR = 'div[class*="ss-facet-avatar"]'
+RESULT_LIST_MARKER = 'class="selfServiceSearchResultList"'
+
+RECORDING_DATE_RE = re.compile(r'(\d{1,2}/\d{1,2}/\d{4})')
+
+def result_list_fragment(html: str) -> str:
+    """Cut a results page down to the result list, skipping the facet sidebar before it"""
+    i = html.find(RESULT_LIST_MARKER)
+    start = html.rfind("<ul", 0, i) if i != -1 else -1
+    return html[start:] if start != -1 else html
+
+def joined_text(lis) -> str:
+    """Non-empty li texts joined with ' | ' (multiple grantors/grantees), each read once"""
+    return ' | '.join(t for t in (li.text(strip=True) for li in lis) if t)
+
+def first_text(lis) -> str:
+    """Text of the first li that has any"""
+    return next((t for t in (li.text(strip=True) for li in lis) if t), "")
+
+def abs_url(href: str) -> str:
+    """urljoin(BASE, href) with a fast path for plain root-relative links"""
+    if href.startswith("/") and not href.startswith("//") and "/." not in href:
+        return BASE + href
+    return urljoin(BASE, href)
+
+@dataclass(slots=True)
 class DocumentRecord:
     """Structure for a single document record"""
     document_id: str = ""
@@ -78,13 +143,52 @@ class DocumentRecord:
     consideration: str = ""
     legal_description: str = ""
     document_url: str = ""
-    additional_info: Dict[str, str] = None
-    
-    def __post_init__(self):
-        if self.additional_info is None:
-            self.additional_info = {}
+    additional_info: Dict[str, str] = field(default_factory=dict)
 
-@dataclass
+def set_recording_date(doc: DocumentRecord, value_lis):
+    """First MM/DD/YYYY date found in the column"""
+    for li in value_lis:
+        # Clean up the date - remove bold tags and extra text
+        date_match = RECORDING_DATE_RE.search(li.text(strip=True))
+        if date_match:
+            doc.recording_date = date_match.group(1)
+            break
+
+def set_grantor(doc: DocumentRecord, value_lis):
+    """All grantor names, ' | '-joined"""
+    grantors = joined_text(value_lis)
+    if grantors:
+        doc.grantor = grantors
+
+def set_grantee(doc: DocumentRecord, value_lis):
+    """All grantee names, ' | '-joined"""
+    grantees = joined_text(value_lis)
+    if grantees:
+        doc.grantee = grantees
+
+def set_consideration(doc: DocumentRecord, value_lis):
+    """First non-empty consideration value"""
+    consideration_text = first_text(value_lis)
+    if consideration_text:
+        doc.consideration = consideration_text
+
+def set_legal_description(doc: DocumentRecord, value_lis):
+    """First non-empty legal description"""
+    legal_text = first_text(value_lis)
+    if legal_text:
+        doc.legal_description = legal_text
+
+# Column header's first word -> the DocumentRecord field it fills
+COLUMN_HANDLERS = {
+    "recording": set_recording_date,
+    "grantor": set_grantor,
+    "grantee": set_grantee,
+    "consideration": set_consideration,
+    "legal": set_legal_description,
+    "description": set_legal_description,
+}
+
+@dataclass(slots=True)
 class SearchResults:
     """Complete search results structure"""
     search_parameters: Dict[str, Any]
@@ -100,8 +204,27 @@ class PimaCountyScraper:
         self.session.headers.update({
             "User-Agent": USER_AGENT,
             "Accept-Language": "en-US,en;q=0.9",
+            # Results pages compress well; only ask for br when we can decode it
+            "Accept-Encoding": "br, gzip, deflate" if brotli is not None else "gzip, deflate",
             "Connection": "keep-alive",
         })
+        # Retry with exponential backoff (honoring Retry-After) on the pooled connection.
+        # urllib3 2.x retries once immediately, then sleeps factor * 2**(n-1):
+        # 0s, 0.7s, 1.4s (+ jitter), close to the old loop's 0.7s, 1.26s, 2.27s
+        retry = Retry(
+            total=MAX_RETRIES,
+            backoff_factor=0.35,
+            **_RETRY_JITTER,  # concurrent fetchers shouldn't retry in lockstep
+            status_forcelist=(429, 500, 502, 503, 504),
+            respect_retry_after_header=True,
+            allowed_methods=frozenset(["GET", "POST"]),
+            raise_on_status=False,
+        )
+        # Pool big enough that the concurrent page fetchers and pings all reuse keep-alive connections
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=retry)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._ping_stop = threading.Event()
         self.results = SearchResults(
             search_parameters={},
             total_pages=0,
@@ -121,6 +244,16 @@ class PimaCountyScraper:
         """Current timestamp in milliseconds"""
         return str(int(time.time() * 1000))
     
+    def step_pause(self, resp: requests.Response):
+        """Pause between setup steps, backing off only if the server throttled this one"""
+        retries = getattr(resp.raw, "retries", None)
+        throttled = resp.status_code in (429, 503) or any(
+            h.status in (429, 503) for h in (retries.history if retries else ())
+        )
+        delay = ESTABLISH_DELAY + (STEP_DELAY if throttled else 0)
+        if delay:
+            time.sleep(delay)
+    
     def ensure_ok(self, resp: requests.Response, label: str):
         """Ensure HTTP response is successful"""
         if not resp.ok:
@@ -151,6 +284,26 @@ class PimaCountyScraper:
             headers["Referer"] = referer
         return self.session.post(url, headers=headers, data=data, timeout=timeout)
     
+    def load_cookies(self) -> bool:
+        """Load the last run's cookies; True if they include a session id"""
+        jar = LWPCookieJar(COOKIE_FILE)
+        try:
+            jar.load(ignore_discard=True)
+        except (OSError, LoadError):
+            return False
+        self.session.cookies.update(jar)
+        return any(c.name == "JSESSIONID" for c in jar)
+    
+    def save_cookies(self):
+        """Save the session cookies (including session-only ones) for the next run"""
+        jar = LWPCookieJar(COOKIE_FILE)
+        for cookie in self.session.cookies:
+            jar.set_cookie(cookie)
+        try:
+            jar.save(ignore_discard=True)
+        except OSError as e:
+            self.vprint(f"⚠️ Could not save cookies: {e}")
+    
     def establish_session(self):
         """Complete session establishment flow"""
         self.vprint("🔐 Establishing session...")
@@ -167,7 +320,7 @@ class PimaCountyScraper:
         }, timeout=REQUEST_TIMEOUT)
         self.ensure_ok(r1, "GET disclaimer")
         self.vprint("✓ GET disclaimer")
-        time.sleep(STEP_DELAY)
+        self.step_pause(r1)
         
         # 2) POST disclaimer acceptance
         r2 = self.ajax_post(
@@ -176,7 +329,7 @@ class PimaCountyScraper:
         )
         self.ensure_ok(r2, "POST disclaimer")
         self.vprint("✓ POST disclaimer acceptance")
-        time.sleep(STEP_DELAY)
+        self.step_pause(r2)
         
         # 3) GET web root
         web_root = urljoin(BASE, "/web/")
@@ -184,33 +337,36 @@ class PimaCountyScraper:
                           params={"_": self.epoch_ms()})
         self.ensure_ok(r3, "GET web root")
         self.vprint("✓ GET web root")
-        time.sleep(STEP_DELAY)
+        self.step_pause(r3)
         
         # 4) POST home actions
         home_actions = urljoin(BASE, "/web/homeActions")
         r4 = self.ajax_post(home_actions, referer=disclaimer, origin=BASE, data=b"")
         self.ensure_ok(r4, "POST home actions")
         self.vprint("✓ POST home actions")
-        time.sleep(STEP_DELAY)
+        self.step_pause(r4)
         
         # 5) GET action group
         action = urljoin(BASE, "/web/action/ACTIONGROUP55S1")
         r5 = self.ajax_get(action, referer=web_root, params={"_": self.epoch_ms()})
         self.ensure_ok(r5, "GET action group")
         self.vprint("✓ GET action group")
-        time.sleep(STEP_DELAY)
+        self.step_pause(r5)
         
         # 6) GET search page
-        search = urljoin(BASE, "/web/search/DOCSEARCH55S8")
-        r6 = self.ajax_get(search, referer=action, params={"_": self.epoch_ms()})
+        r6 = self.ajax_get(SEARCH_URL, referer=action, params={"_": self.epoch_ms()})
         self.ensure_ok(r6, "GET search page")
         self.vprint("✓ GET search page")
-        time.sleep(STEP_DELAY)
+        self.step_pause(r6)
         
         self.vprint("🔓 Session established successfully")
     
-    def submit_search(self):
-        """Submit search with configured parameters"""
+    def submit_search(self, strict: bool = False):
+        """Submit search with configured parameters.
+        
+        With strict=True a reply that isn't a JSON object raises RuntimeError instead
+        of assuming 1 page; a stale resumed session can get a 200 HTML page here.
+        """
         self.vprint(f"🔍 Submitting search: {START_DATE} to {END_DATE}, types: {DOC_TYPES}")
         
         # Validate dates
@@ -256,7 +412,7 @@ class PimaCountyScraper:
                 "X-Requested-With": "XMLHttpRequest",
                 "ajaxRequest": "true",
                 "Origin": BASE,
-                "Referer": urljoin(BASE, "/web/search/DOCSEARCH55S8"),
+                "Referer": SEARCH_URL,
             },
             data=form,
             timeout=REQUEST_TIMEOUT,
@@ -265,66 +421,57 @@ class PimaCountyScraper:
         
         # Parse response to get total pages
         try:
-            response_data = r.json()
+            response_data = orjson.loads(r.content)
+        except orjson.JSONDecodeError:
+            response_data = None
+        if isinstance(response_data, dict):
             self.results.total_pages = response_data.get("totalPages", 1)
             self.vprint(f"✓ Search submitted - {self.results.total_pages} pages found")
-        except json.JSONDecodeError:
+        elif strict:
+            raise RuntimeError("POST search: reply is not JSON (session not accepted?)")
+        else:
             self.vprint("⚠️ Could not parse search response JSON, assuming 1 page")
             self.results.total_pages = 1
         
-        time.sleep(STEP_DELAY)
+        self.step_pause(r)
     
     def fetch_page(self, page_num: int) -> Optional[str]:
         """Fetch a specific results page"""
-        url = urljoin(BASE, "/web/searchResults/DOCSEARCH55S8")
-        final_url = f"{url}?page={page_num}&_={self.epoch_ms()}"
+        final_url = f"{RESULTS_URL}?page={page_num}&_={time.time_ns() // 1_000_000}"
         
-        for attempt in range(1, MAX_RETRIES + 1):
-            try:
-                r = self.session.get(final_url, headers={
-                    "X-Requested-With": "XMLHttpRequest",
-                    "Accept": "*/*",
-                    "Referer": urljoin(BASE, "/web/search/DOCSEARCH55S8"),
-                }, timeout=REQUEST_TIMEOUT)
-                
-                if r.status_code >= 500:
-                    if attempt == MAX_RETRIES:
-                        self.vprint(f"❌ Page {page_num} failed after {MAX_RETRIES} attempts")
-                        return None
-                    backoff = 0.7 * (1.8 ** (attempt - 1)) + random.uniform(0, 0.5)
-                    self.vprint(f"⚠️ Page {page_num} attempt {attempt} failed, retrying in {backoff:.1f}s...")
-                    time.sleep(backoff)
-                    continue
-                
-                self.ensure_ok(r, f"GET page {page_num}")
-                return r.text
-                
-            except requests.RequestException as e:
-                if attempt == MAX_RETRIES:
-                    self.vprint(f"❌ Page {page_num} request failed: {e}")
-                    return None
-                self.vprint(f"⚠️ Page {page_num} request error, retrying: {e}")
-                time.sleep(1)
-        
-        return None
+        # Retries and backoff happen inside the session's urllib3 adapter
+        try:
+            r = self.session.get(final_url, headers=XHR_HEADERS, timeout=REQUEST_TIMEOUT)
+            
+            if r.status_code >= 500:
+                self.vprint(f"❌ Page {page_num} failed after {MAX_RETRIES} retries (HTTP {r.status_code})")
+                return None
+            
+            self.ensure_ok(r, f"GET page {page_num}")
+            return r.text
+            
+        except requests.RequestException as e:
+            self.vprint(f"❌ Page {page_num} request failed: {e}")
+            return None
     
-    def parse_document_from_row(self, row_soup) -> Optional[DocumentRecord]:
+    def parse_document_from_row(self, row) -> Optional[DocumentRecord]:
         """Parse a single document row into a DocumentRecord"""
         try:
             doc = DocumentRecord()
             
             # Extract document ID from data-documentid attribute
-            doc.document_id = row_soup.get('data-documentid', '')
+            attrs = row.attributes
+            doc.document_id = attrs.get('data-documentid') or ''
             if not doc.document_id:
                 # Fallback to ID attribute
-                row_id = row_soup.get('id', '')
+                row_id = attrs.get('id') or ''
                 if row_id.startswith('searchRow'):
                     doc.document_id = row_id.replace('searchRow', '')
             
             # Extract document number and type from header h1
-            h1_elem = row_soup.find('h1')
+            h1_elem = row.css_first('h1')
             if h1_elem:
-                h1_text = h1_elem.get_text(strip=True)
+                h1_text = h1_elem.text(strip=True)
                 # Pattern: document_number • document_type
                 parts = h1_text.split('•')
                 if len(parts) >= 1:
@@ -338,92 +485,56 @@ class PimaCountyScraper:
                         doc.document_type = 'CNLNT'
             
             # Extract document URL
-            href_attr = row_soup.get('data-href', '')
+            href_attr = attrs.get('data-href') or ''
             if href_attr:
-                doc.document_url = urljoin(BASE, href_attr)
+                doc.document_url = abs_url(href_attr)
             
             # Parse the three-column structure
-            columns = row_soup.find_all('div', class_='searchResultThreeColumn')
+            columns = row.css(SEL_COLUMN)
             
             for column in columns:
-                # Get the column header
-                header_li = column.find('li')
-                if not header_li:
+                # One query for the column: the first li is the header, the rest are values
+                lis = column.css('li')
+                if not lis:
                     continue
                 
-                header_text = header_li.get_text(strip=True).lower()
-                
-                # Get all value list items (excluding the header)
-                value_lis = column.find_all('li')[1:]  # Skip first li which is the header
-                
-                if 'recording date' in header_text:
-                    for li in value_lis:
-                        date_text = li.get_text(strip=True)
-                        # Clean up the date - remove bold tags and extra text
-                        date_match = re.search(r'(\d{1,2}/\d{1,2}/\d{4})', date_text)
-                        if date_match:
-                            doc.recording_date = date_match.group(1)
-                            break
+                header_text = lis[0].text(strip=True).lower()
+                value_lis = lis[1:]
                 
-                elif 'grantor' in header_text:
-                    grantors = []
-                    for li in value_lis:
-                        grantor_name = li.get_text(strip=True)
-                        if grantor_name:
-                            grantors.append(grantor_name)
-                    if grantors:
-                        doc.grantor = ' | '.join(grantors)  # Join multiple grantors
-                
-                elif 'grantee' in header_text:
-                    grantees = []
-                    for li in value_lis:
-                        grantee_name = li.get_text(strip=True)
-                        if grantee_name:
-                            grantees.append(grantee_name)
-                    if grantees:
-                        doc.grantee = ' | '.join(grantees)  # Join multiple grantees
-                
-                elif 'consideration' in header_text:
-                    for li in value_lis:
-                        consideration_text = li.get_text(strip=True)
-                        if consideration_text:
-                            doc.consideration = consideration_text
-                            break
-                
-                elif 'legal' in header_text or 'description' in header_text:
-                    for li in value_lis:
-                        legal_text = li.get_text(strip=True)
-                        if legal_text:
-                            doc.legal_description = legal_text
-                            break
+                # Dispatch on the header's first word, e.g. "grantor (2)" -> grantor
+                words = header_text.split(maxsplit=1)
+                handler = COLUMN_HANDLERS.get(words[0].partition('(')[0]) if words else None
+                if handler:
+                    handler(doc, value_lis)
             
             # Extract additional information
             additional_info = {}
             
             # Get all data attributes from the main row
-            for attr, value in row_soup.attrs.items():
+            for attr, value in attrs.items():
                 if attr.startswith('data-') and value:
                     key = attr.replace('data-', '').replace('-', '_')
                     additional_info[key] = str(value)
             
             # Look for any action links (print, view, cart)
-            action_links = row_soup.find_all('a', href=True)
+            action_links = row.css(SEL_ACTION_LINK)
             for link in action_links:
-                href = link.get('href', '')
-                title = link.get('title', '')
+                link_attrs = link.attributes
+                href = link_attrs.get('href') or ''
+                title = link_attrs.get('title') or ''
                 if title:
                     if 'view' in title.lower():
-                        additional_info['view_url'] = urljoin(BASE, href)
+                        additional_info['view_url'] = abs_url(href)
                     elif 'print' in title.lower():
-                        additional_info['print_function'] = link.get('data-function', '')
+                        additional_info['print_function'] = link_attrs.get('data-function') or ''
                     elif 'cart' in title.lower():
-                        additional_info['cart_function'] = link.get('data-function', '')
+                        additional_info['cart_function'] = link_attrs.get('data-function') or ''
             
             # Get avatar information (document status indicator)
-            avatar = row_soup.find('div', class_=re.compile(r'ss-facet-avatar'))
+            avatar = row.css_first(SEL_AVATAR)
             if avatar:
-                avatar_class = ' '.join(avatar.get('class', []))
-                avatar_text = avatar.get_text(strip=True)
+                avatar_class = ' '.join((avatar.attributes.get('class') or '').split())
+                avatar_text = avatar.text(strip=True)
                 additional_info['status_indicator'] = avatar_text
                 additional_info['status_class'] = avatar_class
             
@@ -441,15 +552,16 @@ class PimaCountyScraper:
     def parse_page(self, html_content: str, page_num: int) -> List[DocumentRecord]:
         """Parse all documents from a page of HTML content"""
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
+            # Only build a tree for the part of the page holding the rows
+            tree = HTMLParser(result_list_fragment(html_content))
             documents = []
             
             # Look for the specific search results container
-            search_result_container = soup.find('ul', class_='selfServiceSearchResultList')
+            search_result_container = tree.css_first(SEL_RESULT_LIST)
             
             if search_result_container:
                 # Find all document rows within the container
-                document_rows = search_result_container.find_all('li', class_='ss-search-row')
+                document_rows = search_result_container.css(SEL_ROW)
                 
                 self.vprint(f"📄 Page {page_num}: Found {len(document_rows)} document rows in main container")
                 
@@ -463,7 +575,7 @@ class PimaCountyScraper:
                         self.vprint(f"  ⚠️ Could not parse row {i+1}")
             else:
                 # Fallback: look for any elements with ss-search-row class
-                document_rows = soup.find_all('li', class_='ss-search-row')
+                document_rows = tree.css(SEL_ROW)
                 
                 if document_rows:
                     self.vprint(f"📄 Page {page_num}: Found {len(document_rows)} document rows (fallback method)")
@@ -505,12 +617,7 @@ class PimaCountyScraper:
     def ping_session(self):
         """Send keep-alive ping to maintain session"""
         try:
-            ping_url = urljoin(BASE, "/web/session/pingSession")
-            r = self.session.get(ping_url, params={"_": self.epoch_ms()}, headers={
-                "X-Requested-With": "XMLHttpRequest",
-                "Accept": "*/*",
-                "Referer": urljoin(BASE, "/web/search/DOCSEARCH55S8"),
-            }, timeout=10)
+            r = self.session.get(PING_URL, params={"_": self.epoch_ms()}, headers=XHR_HEADERS, timeout=10)
             
             if r.status_code in (401, 403):
                 self.vprint("⚠️ Session expired, may need to re-authenticate")
@@ -519,43 +626,97 @@ class PimaCountyScraper:
         except:
             return False
     
+    def _ping_worker(self):
+        """Ping every PING_INTERVAL seconds until _ping_stop is set"""
+        while not self._ping_stop.wait(timeout=PING_INTERVAL):
+            self.ping_session()
+    
+    async def fetch_page_async(self, page_num: int) -> Tuple[int, Optional[str]]:
+        """Fetch a page on a worker thread"""
+        # Jitter so the concurrent requests don't hit the server in lockstep
+        await asyncio.sleep(random.uniform(0, PAGE_DELAY))
+        
+        self.vprint(f"📑 Fetching page {page_num}/{self.results.total_pages}...")
+        return page_num, await asyncio.to_thread(self.fetch_page, page_num)
+    
+    async def scrape_pages_concurrently(self, page_nums: range, ndjson, pool: ProcessPoolExecutor) -> Tuple[int, List[int]]:
+        """Fetch pages concurrently and parse them in pool's PARSE_WORKERS processes.
+        
+        Fetchers feed a bounded queue and keep their PAGE_CONCURRENCY slot until the
+        queue takes the page, so fetching stalls once FETCH_AHEAD pages wait for a
+        parser: no more than PAGE_CONCURRENCY + FETCH_AHEAD pages are held at once.
+        Records are written to ndjson in page order. Returns (successful_pages, failed_pages).
+        """
+        sem = asyncio.Semaphore(PAGE_CONCURRENCY)
+        queue = asyncio.Queue(maxsize=FETCH_AHEAD)
+        successful_pages = 0
+        failed_pages = []
+        parsed = {}  # pages that finished ahead of an earlier one
+        next_page = page_nums.start
+        
+        async def fetcher(page_num: int):
+            async with sem:
+                await queue.put(await self.fetch_page_async(page_num))
+        
+        async def parser():
+            nonlocal successful_pages, next_page
+            loop = asyncio.get_running_loop()
+            while (item := await queue.get()) is not None:
+                page_num, html_content = item
+                
+                page_documents = None
+                if html_content is not None:
+                    try:
+                        # Parse in another process (no GIL contention) while the other fetches are in flight
+                        page_documents = await loop.run_in_executor(pool, parse_page_in_worker, html_content, page_num)
+                    except Exception as e:
+                        # e.g. a broken pool; fail the page instead of stalling the fetchers on a full queue
+                        self.vprint(f"❌ Page {page_num} could not be parsed: {e}")
+                
+                if page_documents is None:
+                    failed_pages.append(page_num)
+                else:
+                    successful_pages += 1
+                    self.vprint(f"✓ Page {page_num} complete: {len(page_documents)} documents extracted")
+                parsed[page_num] = page_documents
+                
+                while next_page in parsed:
+                    docs = parsed.pop(next_page) or []
+                    ndjson.writelines(orjson.dumps(doc) + b"\n" for doc in docs)
+                    self.results.total_records += len(docs)
+                    if KEEP_IN_MEMORY:
+                        self.results.documents.extend(docs)
+                    next_page += 1
+        
+        parsers = [asyncio.create_task(parser()) for _ in range(PARSE_WORKERS)]
+        await asyncio.gather(*[fetcher(n) for n in page_nums])
+        
+        # One None sentinel per parser once every page is queued
+        for _ in parsers:
+            await queue.put(None)
+        await asyncio.gather(*parsers)
+        
+        return successful_pages, sorted(failed_pages)
+    
     def scrape_all_pages(self):
         """Main method to scrape all pages"""
         self.vprint(f"🚀 Starting complete scrape of {self.results.total_pages} pages...")
         
         start_time = time.time()
-        successful_pages = 0
-        failed_pages = []
         
-        for page_num in range(1, self.results.total_pages + 1):
-            self.vprint(f"📑 Processing page {page_num}/{self.results.total_pages}...")
-            
-            # Periodic session ping
-            if page_num % 5 == 0:
-                self.ping_session()
-            
-            # Fetch page
-            html_content = self.fetch_page(page_num)
-            if html_content is None:
-                failed_pages.append(page_num)
-                continue
-            
-            # Parse documents from page
-            page_documents = self.parse_page(html_content, page_num)
-            self.results.documents.extend(page_documents)
-            successful_pages += 1
-            
-            self.vprint(f"✓ Page {page_num} complete: {len(page_documents)} documents extracted")
-            
-            # Delay between pages to be respectful
-            if page_num < self.results.total_pages:
-                time.sleep(PAGE_DELAY)
+        # Fetch every page concurrently; the page count is known from the search response.
+        # Records go to disk as each page is parsed instead of piling up in memory
+        os.makedirs(OUTPUT_DIR, exist_ok=True)
+        with open(os.path.join(OUTPUT_DIR, NDJSON_FILE), 'wb') as ndjson, \
+                ProcessPoolExecutor(max_workers=PARSE_WORKERS, mp_context=_PARSE_MP_CONTEXT) as pool:
+            successful_pages, failed_pages = asyncio.run(
+                self.scrape_pages_concurrently(range(1, self.results.total_pages + 1), ndjson, pool)
+            )
         
         # Calculate final stats
         end_time = time.time()
         total_time = end_time - start_time
         
-        self.results.total_records = len(self.results.documents)
         self.results.processing_stats = {
             "total_pages_attempted": self.results.total_pages,
             "successful_pages": successful_pages,
@@ -575,24 +736,41 @@ class PimaCountyScraper:
             self.vprint(f"   ❌ Failed pages: {failed_pages}")
     
     def save_results(self):
-        """Save all results to JSON file"""
+        """Save all results to JSON file, copying documents over from the NDJSON stream.
+        
+        The summary is also written on its own next to the NDJSON records.
+        """
         os.makedirs(OUTPUT_DIR, exist_ok=True)
         output_path = os.path.join(OUTPUT_DIR, OUTPUT_FILE)
+        ndjson_path = os.path.join(OUTPUT_DIR, NDJSON_FILE)
+        summary_path = os.path.join(OUTPUT_DIR, SUMMARY_FILE)
         
-        # Convert dataclasses to dictionaries
         results_dict = {
             "search_parameters": self.results.search_parameters,
             "total_pages": self.results.total_pages,
             "total_records": self.results.total_records,
-            "documents": [asdict(doc) for doc in self.results.documents],
             "search_timestamp": self.results.search_timestamp,
             "processing_stats": self.results.processing_stats
         }
+        summary = orjson.dumps(results_dict, option=orjson.OPT_INDENT_2)
+        
+        with open(summary_path, 'wb') as f:
+            f.write(summary)
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(results_dict, f, indent=2, ensure_ascii=False)
+        with open(output_path, 'wb') as f:
+            # Reopen the object and splice the records in one line at a time
+            f.write(summary[:-2])
+            f.write(b',\n  "documents": [')
+            sep = b"\n    "
+            if os.path.exists(ndjson_path):
+                with open(ndjson_path, 'rb') as records:
+                    for line in records:
+                        f.write(sep + line.rstrip(b"\n"))
+                        sep = b",\n    "
+            f.write(b"\n  ]\n}")
         
         self.vprint(f"💾 Results saved to: {output_path}")
+        self.vprint(f"   🧾 Records: {ndjson_path}, summary: {summary_path}")
         self.vprint(f"   📄 File size: {os.path.getsize(output_path) / 1024:.1f} KB")
         
         return output_path
@@ -600,8 +778,26 @@ class PimaCountyScraper:
     def run(self):
         """Main execution method"""
         try:
-            self.establish_session()
-            self.submit_search()
+            # Skip the handshake when last run's session is still alive
+            resumed = self.load_cookies() and self.ping_session()
+            if resumed:
+                self.vprint("♻️ Reusing saved session")
+            else:
+                self.establish_session()
+            
+            # Keep the session alive on a timer instead of from the page loop
+            threading.Thread(target=self._ping_worker, daemon=True).start()
+            
+            try:
+                # A resumed session that gets anything but the JSON reply counts as rejected
+                self.submit_search(strict=resumed)
+            except RuntimeError:
+                if not resumed:
+                    raise
+                self.vprint("⚠️ Saved session was rejected, establishing a new one...")
+                self.session.cookies.clear()
+                self.establish_session()
+                self.submit_search()
             
             if self.results.total_pages > 0:
                 self.scrape_all_pages()
@@ -620,15 +816,31 @@ class PimaCountyScraper:
                 
         except KeyboardInterrupt:
             self.vprint("\n⚠️ Process interrupted by user")
-            if self.results.documents:
+            if self.results.total_records:
                 self.vprint("💾 Saving partial results...")
                 self.save_results()
         except Exception as e:
             self.vprint(f"\n❌ Error during execution: {e}")
-            if self.results.documents:
+            if self.results.total_records:
                 self.vprint("💾 Saving partial results...")
                 self.save_results()
             raise
+        finally:
+            self._ping_stop.set()
+            self.save_cookies()
+
+_worker_scraper = None
+
+# Parse workers start while the ping and fetch threads are running; forking a
+# threaded process can deadlock the child on inherited locks, so spawn them fresh
+_PARSE_MP_CONTEXT = multiprocessing.get_context("spawn")
+
+def parse_page_in_worker(html_content: str, page_num: int) -> List[DocumentRecord]:
+    """ProcessPoolExecutor entry point: parse a page with this process's own scraper"""
+    global _worker_scraper
+    if _worker_scraper is None:
+        _worker_scraper = PimaCountyScraper()
+    return _worker_scraper.parse_page(html_content, page_num)
 
 def main():
     """Main entry point"""